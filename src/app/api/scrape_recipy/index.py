@@ -1,13 +1,38 @@
 from http.server import BaseHTTPRequestHandler
-import json
+import threading
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from cachetools import TTLCache
+import orjson
 from recipe_scrapers import scrape_me
 
+# Recipe pages rarely change, so keep scraped results for an hour per warm instance.
+RECIPE_CACHE = TTLCache(maxsize=512, ttl=3600)
+RECIPE_CACHE_LOCK = threading.RLock()
+
+TRACKING_PARAMS = ('utm_', 'fbclid', 'gclid', 'mc_cid', 'mc_eid')
+
+
+def normalize_url(parts):
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(TRACKING_PARAMS)
+    ]
+    return urlunsplit((
+        parts.scheme.lower(),
+        parts.netloc.lower(),
+        parts.path,
+        urlencode(query),
+        '',
+    ))
+
+
 class handler(BaseHTTPRequestHandler):
 
     def do_POST(self):
         content_length = int(self.headers['Content-Length'])
         post_data = self.rfile.read(content_length)
-        data = json.loads(post_data)
+        data = orjson.loads(post_data)
         url = data.get('url')
 
         if not url:
@@ -15,26 +40,37 @@ class handler(BaseHTTPRequestHandler):
             self.send_header('Content-type', 'application/json')
             self.end_headers()
             response = {'error': 'URL is required'}
-            self.wfile.write(json.dumps(response).encode('utf-8'))
+            self.wfile.write(orjson.dumps(response))
             return
 
         try:
-            scraper = scrape_me(url)
-            recipe_details = {
-                'imageUrl': scraper.image(),
-                'instructions': scraper.instructions(),
-                'ingredients': scraper.ingredients(),
-            }
+            url = url.strip()
+            parts = urlsplit(url)
+            cache_key = normalize_url(parts)
+            with RECIPE_CACHE_LOCK:
+                recipe_details = RECIPE_CACHE.get(cache_key)
+
+            if recipe_details is None:
+                # Sites without a dedicated scraper fall back to schema.org parsing.
+                scraper = scrape_me(url, wild_mode=True)
+                recipe_details = {
+                    'imageUrl': scraper.image(),
+                    'instructions': scraper.instructions(),
+                    'ingredients': scraper.ingredients(),
+                }
+                with RECIPE_CACHE_LOCK:
+                    RECIPE_CACHE[cache_key] = recipe_details
+
             self.send_response(200)
             self.send_header('Content-type', 'application/json')
             self.end_headers()
-            self.wfile.write(json.dumps(recipe_details).encode('utf-8'))
+            self.wfile.write(orjson.dumps(recipe_details))
         except Exception as e:
             self.send_response(500)
             self.send_header('Content-type', 'application/json')
             self.end_headers()
             response = {'error': str(e)}
-            self.wfile.write(json.dumps(response).encode('utf-8'))
+            self.wfile.write(orjson.dumps(response))
             return
 
 